@@ -3,14 +3,36 @@
 from __future__ import annotations
 
 from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .routes.extract import extract_bp
 from .routes.health import health_bp
 from .routes.proxy import proxy_bp
 
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Encode compact JSON with orjson; indented (debug) output keeps the stdlib path."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        if "indent" in kwargs:
+            return super().dumps(obj, **kwargs)
+
+        # Dates still go through Flask's default hook so they keep the http_date format.
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+
 def create_app() -> Flask:
     app = Flask(__name__)
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
 
     app.register_blueprint(extract_bp)
     app.register_blueprint(health_bp)
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import httpx
 import re
+from functools import lru_cache
+from urllib.parse import urlsplit
 
 DEFAULT_USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -24,112 +26,177 @@ DEFAULT_HEADERS = {
 }
 
 try:
-    HTTP_CLIENT = httpx.Client(
-        http2=True,
-        timeout=10.0,
-        follow_redirects=True,
-        headers={"User-Agent": DEFAULT_USER_AGENT},
-        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20, keepalive_expiry=300),
-    )
+    import h2  # noqa: F401
+
+    _HTTP2 = True
 except ImportError:
-    HTTP_CLIENT = httpx.Client(
-        timeout=10.0,
-        follow_redirects=True,
-        headers={"User-Agent": DEFAULT_USER_AGENT},
-        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20, keepalive_expiry=300),
-    )
+    _HTTP2 = False
+
+_HTTP_CLIENT_KWARGS = {
+    "timeout": 10.0,
+    "follow_redirects": True,
+    "headers": {"User-Agent": DEFAULT_USER_AGENT},
+    "limits": httpx.Limits(max_keepalive_connections=10, max_connections=20, keepalive_expiry=300),
+}
+
+HTTP_CLIENT = httpx.Client(http2=_HTTP2, **_HTTP_CLIENT_KWARGS)
+
+
+# Async clients are bound to their event loop, so callers build one per loop.
+def create_async_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(http2=_HTTP2, **_HTTP_CLIENT_KWARGS)
+
 
 PLATFORM_CONFIG = {
     "youtube": {
         "extractor": "yt-dlp",
         "patterns": [r"youtube\.com", r"youtu\.be", r"youtube-nocookie\.com"],
+        "hosts": ["youtube.com", "youtu.be", "youtube-nocookie.com"],
         "nsfw": False,
     },
     "bilibili": {
         "extractor": "yt-dlp",
         "patterns": [r"bilibili\.com", r"bilibili\.tv", r"b23\.tv"],
+        "hosts": ["bilibili.com", "bilibili.tv", "b23.tv"],
         "nsfw": False,
     },
     "reddit": {
         "extractor": "gallery-dl",
         "patterns": [r"reddit\.com", r"redd\.it", r"v\.redd\.it"],
+        "hosts": ["reddit.com", "redd.it"],
         "nsfw": False,
     },
     "soundcloud": {
         "extractor": "yt-dlp",
         "patterns": [r"soundcloud\.com"],
+        "hosts": ["soundcloud.com"],
         "nsfw": False,
     },
     "eporner": {
         "extractor": "yt-dlp",
         "patterns": [r"eporner\.com"],
+        "hosts": ["eporner.com"],
         "nsfw": True,
     },
     "rule34video": {
         "extractor": "yt-dlp",
         "patterns": [r"rule34video\.com"],
+        "hosts": ["rule34video.com"],
         "nsfw": True,
     },
     "twitch": {
         "extractor": "yt-dlp",
         "patterns": [r"twitch\.tv/\w+/clip", r"clips\.twitch\.tv"],
+        "hosts": ["clips.twitch.tv"],
         "nsfw": False,
     },
     "bandcamp": {
         "extractor": "yt-dlp",
         "patterns": [r"bandcamp\.com", r"\w+\.bandcamp\.com"],
+        "hosts": ["bandcamp.com"],
         "nsfw": False,
     },
     "weibo": {
         "extractor": "gallery-dl",
         "patterns": [r"weibo\.com", r"weibo\.cn"],
+        "hosts": ["weibo.com", "weibo.cn"],
         "nsfw": False,
     },
     "pinterest": {
         "extractor": "gallery-dl",
         "patterns": [r"pinterest\.com", r"pin\.it"],
+        "hosts": ["pinterest.com", "pin.it"],
         "nsfw": False,
     },
     "pixiv": {
         "extractor": "native",
         "patterns": [r"pixiv\.net"],
+        "hosts": ["pixiv.net"],
         "nsfw": False,
     },
 }
 
 PLATFORMS = {name: cfg["patterns"] for name, cfg in PLATFORM_CONFIG.items()}
-YTDLP_PLATFORMS = [name for name, cfg in PLATFORM_CONFIG.items() if cfg["extractor"] == "yt-dlp"]
-GALLERY_DL_PLATFORMS = [name for name, cfg in PLATFORM_CONFIG.items() if cfg["extractor"] == "gallery-dl"]
-NSFW_PLATFORMS = [name for name, cfg in PLATFORM_CONFIG.items() if cfg["nsfw"]]
+# One alternation per platform, in declaration order, for the detect_platform fallback scan.
+_PLATFORM_REGEXES = tuple(
+    (name, re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE))
+    for name, patterns in PLATFORMS.items()
+)
+YTDLP_PLATFORMS = frozenset(name for name, cfg in PLATFORM_CONFIG.items() if cfg["extractor"] == "yt-dlp")
+GALLERY_DL_PLATFORMS = frozenset(name for name, cfg in PLATFORM_CONFIG.items() if cfg["extractor"] == "gallery-dl")
+NSFW_PLATFORMS = frozenset(name for name, cfg in PLATFORM_CONFIG.items() if cfg["nsfw"])
+
+# "hosts" are registrable-domain suffixes; "patterns" stay as the fallback for URLs
+# whose platform is not implied by the hostname alone (e.g. twitch.tv/<user>/clip/...).
+_HOST_SUFFIX_TO_PLATFORM = {host: name for name, cfg in PLATFORM_CONFIG.items() for host in cfg["hosts"]}
 
-SHORT_URL_PATTERNS = {
+_RAW_SHORT_URL_PATTERNS = {
     "pin.it": r"pin\.it",
     "b23.tv": r"b23\.tv",
     "redd.it": r"redd\.it",
 }
 
-TRACKING_PARAMS = [
-    "utm_source",
-    "utm_medium",
-    "utm_campaign",
-    "utm_term",
-    "utm_content",
-    "fbclid",
-    "gclid",
-    "ref",
-    "ref_src",
-    "ref_url",
-    "share_id",
-    "sent",
-    "spm_id_from",
-    "vd_source",
-    "from",
-    "seid",
-]
+SHORT_URL_PATTERNS = {name: re.compile(pattern, re.IGNORECASE) for name, pattern in _RAW_SHORT_URL_PATTERNS.items()}
 
+# Named-group names must be identifiers, so "pin.it" becomes group "pin_it".
+_SHORT_URL_GROUPS = {name.replace(".", "_"): name for name in _RAW_SHORT_URL_PATTERNS}
+_SHORT_URL_COMBINED = re.compile(
+    "|".join(f"(?P<{group}>{_RAW_SHORT_URL_PATTERNS[name]})" for group, name in _SHORT_URL_GROUPS.items()),
+    re.IGNORECASE,
+)
 
+TRACKING_PARAMS = frozenset(
+    {
+        "utm_source",
+        "utm_medium",
+        "utm_campaign",
+        "utm_term",
+        "utm_content",
+        "fbclid",
+        "gclid",
+        "ref",
+        "ref_src",
+        "ref_url",
+        "share_id",
+        "sent",
+        "spm_id_from",
+        "vd_source",
+        "from",
+        "seid",
+    }
+)
+
+
+def _platform_from_host(url: str) -> str | None:
+    try:
+        host = urlsplit(url).hostname or ""
+    except ValueError:
+        return None
+    return _platform_for_hostname(host)
+
+
+@lru_cache(maxsize=4096)
+def _platform_for_hostname(host: str) -> str | None:
+    while host:
+        platform = _HOST_SUFFIX_TO_PLATFORM.get(host)
+        if platform:
+            return platform
+        host = host.partition(".")[2]
+    return None
+
+
+@lru_cache(maxsize=4096)
 def detect_platform(url: str) -> str | None:
-    for platform, patterns in PLATFORMS.items():
-        if any(re.search(pattern, url, re.IGNORECASE) for pattern in patterns):
+    platform = _platform_from_host(url)
+    if platform:
+        return platform
+    for platform, regex in _PLATFORM_REGEXES:
+        if regex.search(url):
             return platform
     return None
+
+
+def match_short_url(url: str) -> str | None:
+    """Return the SHORT_URL_PATTERNS key that matches url, if any, in one regex scan."""
+    match = _SHORT_URL_COMBINED.search(url)
+    return _SHORT_URL_GROUPS[match.lastgroup] if match else None
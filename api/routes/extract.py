@@ -7,12 +7,23 @@ from flask import Blueprint, jsonify, request
 from ..config import GALLERY_DL_PLATFORMS, NSFW_PLATFORMS, YTDLP_PLATFORMS, detect_platform
 from ..errors import ErrorCode, create_error_response
 from ..security import sanitize_cookie, sanitize_output, validate_url
-from ..services.gallery_dl import extract_with_gallery_dl
-from ..services.ytdlp import extract_with_ytdlp
 
 extract_bp = Blueprint("extract", __name__)
 
 
+# yt-dlp and gallery-dl are heavy to import, so the services load on the first extraction.
+def extract_with_ytdlp(url: str, cookie: str | None = None) -> dict:
+    from ..services.ytdlp import extract_with_ytdlp as _extract
+
+    return _extract(url, cookie)
+
+
+def extract_with_gallery_dl(url: str, cookie: str | None = None) -> dict:
+    from ..services.gallery_dl import extract_with_gallery_dl as _extract
+
+    return _extract(url, cookie)
+
+
 def _cors_headers() -> dict:
     return {
         "Access-Control-Allow-Origin": "*",
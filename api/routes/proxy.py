@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import re
 from urllib.parse import quote, urljoin
 
 from flask import Blueprint, Response, request
@@ -10,6 +11,9 @@ from ..config import HTTP_CLIENT
 
 proxy_bp = Blueprint("proxy", __name__)
 
+# Non-empty, non-tag playlist lines are segment or variant URIs.
+_PLAYLIST_URI_RE = re.compile(r"^(?!#)([^\r\n]+)", re.MULTILINE)
+
 
 def _cors_headers() -> dict:
     return {
@@ -20,22 +24,14 @@ def _cors_headers() -> dict:
     }
 
 
-@proxy_bp.route("/api/yt-stream", methods=["GET", "OPTIONS"])
-def yt_stream():
-    if request.method == "OPTIONS":
-        return ("", 204, _cors_headers())
-
-    target_url = request.args.get("url", "").strip()
-    if not target_url:
-        return ({"success": False, "error": {"code": "INVALID_URL", "message": "Missing url"}}, 400, _cors_headers())
-
-    is_chunk = request.args.get("chunk") == "1"
+def _rewrite_playlist(playlist_text: str, base_url: str) -> str:
+    return _PLAYLIST_URI_RE.sub(
+        lambda m: f"/api/yt-stream?url={quote(urljoin(base_url, m.group(1)), safe='')}&chunk=1",
+        playlist_text,
+    )
 
-    try:
-        upstream = HTTP_CLIENT.get(target_url)
-    except Exception as exc:
-        return ({"success": False, "error": {"code": "FETCH_FAILED", "message": str(exc)}}, 500, _cors_headers())
 
+def _build_response(upstream, target_url: str, is_chunk: bool) -> Response:
     headers = _cors_headers()
     content_type = upstream.headers.get("content-type", "")
 
@@ -45,20 +41,35 @@ def yt_stream():
         headers["Cache-Control"] = "public, max-age=300"
         return Response(upstream.content, status=upstream.status_code, headers=headers)
 
-    playlist_text = upstream.text
-    if ".m3u8" in target_url or "mpegurl" in content_type:
-        rewritten_lines = []
-        for line in playlist_text.splitlines():
-            if not line or line.startswith("#"):
-                rewritten_lines.append(line)
-                continue
-            absolute = urljoin(target_url, line)
-            rewritten_lines.append(f"/api/yt-stream?url={quote(absolute, safe='')}&chunk=1")
-
+    mime = content_type.partition(";")[0].strip().lower()
+    if ".m3u8" in target_url or "mpegurl" in mime:
+        rewritten = _rewrite_playlist(upstream.text, target_url)
         headers["Content-Type"] = "application/vnd.apple.mpegurl"
         headers["Cache-Control"] = "no-cache"
-        return Response("\n".join(rewritten_lines), status=upstream.status_code, headers=headers)
+        return Response(rewritten, status=upstream.status_code, headers=headers)
 
     if content_type:
         headers["Content-Type"] = content_type
     return Response(upstream.content, status=upstream.status_code, headers=headers)
+
+
+@proxy_bp.route("/api/yt-stream", methods=["GET", "OPTIONS"])
+def yt_stream():
+    if request.method == "OPTIONS":
+        return ("", 204, _cors_headers())
+
+    target_url = request.args.get("url", "").strip()
+    if not target_url:
+        return ({"success": False, "error": {"code": "INVALID_URL", "message": "Missing url"}}, 400, _cors_headers())
+
+    is_chunk = request.args.get("chunk") == "1"
+
+    try:
+        upstream = HTTP_CLIENT.get(target_url)
+    except Exception as exc:
+        return ({"success": False, "error": {"code": "FETCH_FAILED", "message": str(exc)}}, 500, _cors_headers())
+
+    try:
+        return _build_response(upstream, target_url, is_chunk)
+    finally:
+        upstream.close()
@@ -9,6 +9,8 @@ from urllib.parse import urlparse
 MAX_URL_LENGTH = 2048
 MAX_COOKIE_LENGTH = 8192
 
+_NETSCAPE_HEADER = "# Netscape HTTP Cookie File\n# https://curl.haxx.se/rfc/cookie_spec.html\n\n"
+
 BLOCKED_HOST_PATTERNS = [
     r"^localhost$",
     r"^127\.",
@@ -102,16 +104,16 @@ def convert_cookie_to_netscape(cookie: str, domain: str | None = None) -> str:
 
     if "\t" in cookie:
         lines = cookie.split("\n")
-        valid = sum(1 for line in lines if line.strip() and not line.startswith("#") and len(line.split("\t")) >= 7)
-        if valid > 0:
-            return "# Netscape HTTP Cookie File\n# https://curl.haxx.se/rfc/cookie_spec.html\n\n" + cookie
+        valid = any(line.count("\t") >= 6 and line.strip() and not line.startswith("#") for line in lines)
+        if valid:
+            return _NETSCAPE_HEADER + cookie
 
     if cookie.startswith("[") or cookie.startswith("{"):
         try:
             data = json.loads(cookie)
             if not isinstance(data, list):
                 data = [data]
-            lines = ["# Netscape HTTP Cookie File", "# https://curl.haxx.se/rfc/cookie_spec.html", ""]
+            lines = []
             for c in data:
                 if not isinstance(c, dict) or "name" not in c or "value" not in c:
                     continue
@@ -127,14 +129,14 @@ def convert_cookie_to_netscape(cookie: str, domain: str | None = None) -> str:
                 lines.append(
                     f"{c_domain}\t{host_only}\t{path}\t{secure}\t{expiry}\t{c['name']}\t{c['value']}"
                 )
-            return "\n".join(lines)
+            return _NETSCAPE_HEADER + "\n".join(lines)
         except json.JSONDecodeError:
             pass
 
     if "=" in cookie and ";" in cookie and domain:
         if not domain.startswith("."):
             domain = "." + domain
-        lines = ["# Netscape HTTP Cookie File", "# https://curl.haxx.se/rfc/cookie_spec.html", ""]
+        lines = []
         for pair in cookie.split(";"):
             pair = pair.strip()
             if "=" not in pair:
@@ -144,8 +146,8 @@ def convert_cookie_to_netscape(cookie: str, domain: str | None = None) -> str:
             value = pair[idx + 1 :].strip()
             if name and value:
                 lines.append(f"{domain}\tTRUE\t/\tTRUE\t0\t{name}\t{value}")
-        if len(lines) > 3:
-            return "\n".join(lines)
+        if lines:
+            return _NETSCAPE_HEADER + "\n".join(lines)
 
     return cookie
 
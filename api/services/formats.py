@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 
 
 MIME_TO_EXTENSION = {
@@ -27,40 +28,57 @@ CODEC_PRIORITY = {"H.264": 0, "VP9": 1, "AV1": 2, "HEVC": 3}
 TARGET_HEIGHTS = (1080, 720, 480, 360, 240, 144)
 
 
+_VIDEO_CODEC_RE = re.compile(r"(avc1|h264|avc|vp9|av01|av1|hevc|h265|hev1|hvc1)")
+_VIDEO_TOKEN_TO_NAME = {
+    "avc1": "H.264",
+    "h264": "H.264",
+    "avc": "H.264",
+    "vp9": "VP9",
+    "av01": "AV1",
+    "av1": "AV1",
+    "hevc": "HEVC",
+    "h265": "HEVC",
+    "hev1": "HEVC",
+    "hvc1": "HEVC",
+}
+
+_AUDIO_CODEC_RE = re.compile(r"(mp4a|aac|opus|mp3|vorbis|flac)")
+_AUDIO_TOKEN_TO_NAME = {
+    "mp4a": "AAC",
+    "aac": "AAC",
+    "opus": "Opus",
+    "mp3": "MP3",
+    "vorbis": "Vorbis",
+    "flac": "FLAC",
+}
+
+_HLS_URL_RE = re.compile(r"\.m3u8(?:$|[?#])|/manifest/", re.IGNORECASE)
+
+# Control characters plus characters that are invalid in Windows filenames
+_FORBIDDEN_FILENAME_CHARS = dict.fromkeys([*range(32), *map(ord, '<>:"/\\|?*')])
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=256)
 def normalize_codec_name(codec: str) -> str:
     """Normalize video codec name to standard format."""
-    value = (codec or "").lower()
-    if any(x in value for x in ("avc1", "h264", "avc")):
-        return "H.264"
-    if "vp9" in value:
-        return "VP9"
-    if "av01" in value or "av1" in value:
-        return "AV1"
-    if any(x in value for x in ("hevc", "h265", "hev1", "hvc1")):
-        return "HEVC"
-    return codec or "Unknown"
+    match = _VIDEO_CODEC_RE.search((codec or "").lower())
+    return _VIDEO_TOKEN_TO_NAME[match.group(1)] if match else (codec or "Unknown")
 
 
+@lru_cache(maxsize=256)
 def normalize_audio_codec_name(codec: str) -> str:
     """Normalize audio codec name to standard format."""
-    value = (codec or "").lower()
-    if any(x in value for x in ("mp4a", "aac")):
-        return "AAC"
-    if "opus" in value:
-        return "Opus"
-    if "mp3" in value:
-        return "MP3"
-    if "vorbis" in value:
-        return "Vorbis"
-    if "flac" in value:
-        return "FLAC"
-    return codec or "Unknown"
+    match = _AUDIO_CODEC_RE.search((codec or "").lower())
+    return _AUDIO_TOKEN_TO_NAME[match.group(1)] if match else (codec or "Unknown")
 
 
+@lru_cache(maxsize=256)
 def get_extension_from_mime(mime: str) -> str | None:
     return MIME_TO_EXTENSION.get((mime or "").lower())
 
 
+@lru_cache(maxsize=256)
 def get_mime_from_extension(ext: str, media_type: str = "video") -> str:
     normalized = (ext or "").lower().lstrip(".")
     mapped = EXTENSION_TO_MIME.get(normalized)
@@ -72,8 +90,8 @@ def get_mime_from_extension(ext: str, media_type: str = "video") -> str:
 def sanitize_filename(name: str, max_length: int = 50) -> str:
     if not name:
         return "media"
-    sanitized = re.sub(r'[<>:"/\|?*\x00-\x1F]', "", name).strip().rstrip(".")
-    sanitized = re.sub(r"\s+", " ", sanitized)
+    sanitized = name.translate(_FORBIDDEN_FILENAME_CHARS).strip().rstrip(".")
+    sanitized = _WHITESPACE_RE.sub(" ", sanitized)
     if len(sanitized) > max_length:
         sanitized = sanitized[:max_length].rstrip()
     return sanitized or "media"
@@ -87,68 +105,61 @@ def generate_filename(info: dict, fmt: dict, media_type: str) -> str:
     return f"{title}_{quality}.{ext}"
 
 
-def _is_audio_only(fmt: dict) -> bool:
-    """Check if format is audio-only (no video)."""
-    vc = fmt.get("vcodec", "none")
-    ac = fmt.get("acodec", "none")
-    # yt-dlp uses "none" string for missing codecs
-    return vc == "none" and ac not in (None, "none", "")
-
-
-def _is_video(fmt: dict) -> bool:
-    """Check if format has video."""
-    vc = fmt.get("vcodec", "none")
-    return vc not in (None, "none", "")
-
-
-def _is_progressive(fmt: dict) -> bool:
-    """Check if format has both video and audio (progressive/combined)."""
-    vc = fmt.get("vcodec", "none")
-    ac = fmt.get("acodec", "none")
-    return vc not in (None, "none", "") and ac not in (None, "none", "")
-
-
 def is_hls_format(fmt: dict) -> bool:
     """Check if format is HLS (m3u8 manifest)."""
-    url = (fmt.get("url") or "").lower()
+    if _HLS_URL_RE.search(fmt.get("url") or ""):
+        return True
     proto = (fmt.get("protocol") or "").lower()
-    ext = (fmt.get("ext") or "").lower()
-    return (
-        ".m3u8" in url
-        or "m3u8" in proto
-        or ext == "m3u8"
-        or "/manifest/" in url
-        or "index.m3u8" in url
-        or proto == "hls"
-    )
+    # yt-dlp reports "m3u8" and "m3u8_native" as well as plain "hls"
+    return "m3u8" in proto or proto == "hls" or (fmt.get("ext") or "").lower() == "m3u8"
 
 
-def _format_source(fmt: dict, media_type: str, is_progressive: bool = False) -> dict:
-    """Build a source dict from yt-dlp format."""
+def _classify(fmt: dict) -> dict:
+    """Derive the per-format fields used for grouping and source building once."""
+    vcodec = fmt.get("vcodec")
+    acodec = fmt.get("acodec")
+    is_video = vcodec not in (None, "none", "")
+    has_audio = acodec not in (None, "none", "")
+    return {
+        "fmt": fmt,
+        "height": fmt.get("height") or 0,
+        "is_video": is_video,
+        "has_audio": has_audio,
+        # yt-dlp uses "none" string for missing codecs
+        "is_audio_only": fmt.get("vcodec", "none") == "none" and has_audio,
+        "is_progressive": is_video and has_audio,
+        "is_hls": is_hls_format(fmt),
+        "codec": normalize_codec_name(vcodec) if is_video else normalize_audio_codec_name(acodec or ""),
+    }
+
+
+def _format_source(rec: dict, media_type: str, is_progressive: bool = False) -> dict:
+    """Build a source dict from a classified yt-dlp format."""
+    fmt = rec["fmt"]
     ext = fmt.get("ext")
-    mime = fmt.get("mime_type") or get_mime_from_extension(ext or "", media_type)
     height = fmt.get("height")
     width = fmt.get("width")
+    fps = fmt.get("fps")
+    mime = fmt.get("mime_type") or get_mime_from_extension(ext or "", media_type)
     resolution = f"{width}x{height}" if width and height else None
-    
+
     # Build quality string
     quality = fmt.get("format_note") or ""
     if not quality and height:
         quality = f"{height}p"
     if not quality:
         quality = "source"
-    
+
     # Add FPS if > 30
-    fps = fmt.get("fps")
     if fps and fps > 30:
         quality = f"{quality}{int(fps)}" if quality.endswith("p") else f"{quality} {fps}fps"
-    
-    # Get codec
-    if _is_video(fmt):
-        codec = normalize_codec_name(fmt.get("vcodec") or "")
+
+    has_audio = rec["has_audio"]
+    if is_progressive:
+        delivery = "progressive"
     else:
-        codec = normalize_audio_codec_name(fmt.get("acodec") or "")
-    
+        delivery = "hls" if rec["is_hls"] else "dash"
+
     return {
         "quality": str(quality),
         "url": fmt.get("url") or "",
@@ -156,47 +167,47 @@ def _format_source(fmt: dict, media_type: str, is_progressive: bool = False) ->
         "mime": mime,
         "extension": ext,
         "bitrate": fmt.get("abr"),
-        "codec": codec,
-        "hasAudio": fmt.get("acodec") not in (None, "none", ""),
-        "needsMerge": _is_video(fmt) and fmt.get("acodec") in (None, "none", ""),
-        "format": "progressive" if is_progressive else ("hls" if is_hls_format(fmt) else "dash"),
+        "codec": rec["codec"],
+        "hasAudio": has_audio,
+        "needsMerge": rec["is_video"] and not has_audio,
+        "format": delivery,
         "formatId": fmt.get("format_id"),
         "filesize": fmt.get("filesize") or fmt.get("filesize_approx"),
     }
 
 
-def process_audio_formats(audio_formats: list[dict], target_bitrate: int = 128) -> list[dict]:
-    """Process audio-only formats, return best options per codec."""
-    if not audio_formats:
+def _process_audio_records(records: list[dict], target_bitrate: int = 128) -> list[dict]:
+    if not records:
         return []
-    
+
     # Group by codec
     by_codec: dict[str, list[dict]] = {}
-    for fmt in audio_formats:
-        codec = normalize_audio_codec_name(fmt.get("acodec") or "")
-        if codec not in by_codec:
-            by_codec[codec] = []
-        by_codec[codec].append(fmt)
-    
+    for rec in records:
+        codec = normalize_audio_codec_name(rec["fmt"].get("acodec") or "")
+        by_codec.setdefault(codec, []).append(rec)
+
     # Pick best from each codec (closest to target bitrate)
     result: list[dict] = []
     codec_order = ["AAC", "Opus", "MP3", "Vorbis", "FLAC"]  # Preference order
-    
+
     for codec in codec_order:
         if codec not in by_codec:
             continue
-        
-        candidates = by_codec[codec]
-        # Sort by distance from target bitrate
-        candidates.sort(key=lambda f: abs((f.get("abr") or 0) - target_bitrate))
-        
-        # Pick the best one
-        best = candidates[0]
+
+        # Pick the one closest to the target bitrate
+        best = min(by_codec[codec], key=lambda r: abs((r["fmt"].get("abr") or 0) - target_bitrate))
         result.append(_format_source(best, "audio"))
-    
+
     return result
 
 
+def process_audio_formats(audio_formats: list[dict], target_bitrate: int = 128) -> list[dict]:
+    """Process audio-only formats, return best options per codec."""
+    if not audio_formats:
+        return []
+    return _process_audio_records([_classify(fmt) for fmt in audio_formats], target_bitrate)
+
+
 def process_video_formats(
     formats: list[dict],
     info: dict,
@@ -206,44 +217,34 @@ def process_video_formats(
     """Process formats for non-YouTube platforms."""
     videos: list[dict] = []
     audios: list[dict] = []
-    
-    for fmt in formats or []:
-        if not fmt.get("url"):
-            continue
-        if is_hls_format(fmt):
-            continue
-        if _is_audio_only(fmt):
-            audios.append(fmt)
-        elif _is_video(fmt):
-            videos.append(fmt)
-    
-    # Group by height
-    by_height: dict[int, list[dict]] = {}
-    for fmt in videos:
-        h = fmt.get("height") or 0
-        if h <= 0:
+
+    for rec in [_classify(fmt) for fmt in formats or [] if fmt.get("url")]:
+        if rec["is_hls"]:
             continue
-        if h not in by_height:
-            by_height[h] = []
-        by_height[h].append(fmt)
-    
-    # Select best codec per height
+        if rec["is_audio_only"]:
+            audios.append(rec)
+        elif rec["is_video"]:
+            videos.append(rec)
+
+    # Rank by (height desc, codec priority) once and keep the first format per height
+    ranked = sorted(
+        (rec for rec in videos if rec["height"] > 0 and rec["height"] in target_heights),
+        key=lambda r: (-r["height"], codec_priority.get(r["codec"], 99)),
+    )
     selected: list[dict] = []
-    for h in sorted(by_height.keys(), reverse=True):
-        if h not in target_heights:
+    last_height = None
+    for rec in ranked:
+        if rec["height"] == last_height:
             continue
-        candidates = by_height[h]
-        # Sort by codec priority
-        candidates.sort(key=lambda f: codec_priority.get(normalize_codec_name(f.get("vcodec") or ""), 99))
-        best = candidates[0]
-        selected.append(_format_source(best, "video", is_progressive=_is_progressive(best)))
-    
+        last_height = rec["height"]
+        selected.append(_format_source(rec, "video", is_progressive=rec["is_progressive"]))
+
     if not selected:
         # Fallback: return top 6
-        for fmt in videos[:6]:
-            selected.append(_format_source(fmt, "video", is_progressive=_is_progressive(fmt)))
-    
-    return selected, process_audio_formats(audios)
+        for rec in videos[:6]:
+            selected.append(_format_source(rec, "video", is_progressive=rec["is_progressive"]))
+
+    return selected, _process_audio_records(audios)
 
 
 def process_youtube_formats(
@@ -257,44 +258,38 @@ def process_youtube_formats(
     audios: list[dict] = []
     progressive: list[dict] = []
     hls_formats: list[dict] = []
-    
-    for fmt in formats or []:
-        if not fmt.get("url"):
-            continue
-        if is_hls_format(fmt):
+
+    for rec in [_classify(fmt) for fmt in formats or [] if fmt.get("url")]:
+        if rec["is_hls"]:
             if include_hls:
-                hls_formats.append(fmt)
+                hls_formats.append(rec)
             continue
-        if _is_audio_only(fmt):
-            audios.append(fmt)
-        elif _is_video(fmt):
-            if _is_progressive(fmt):
-                progressive.append(fmt)
+        if rec["is_audio_only"]:
+            audios.append(rec)
+        elif rec["is_video"]:
+            if rec["is_progressive"]:
+                progressive.append(rec)
             else:
-                videos.append(fmt)
-    
+                videos.append(rec)
+
     result: list[dict] = []
-    
+
     progressive_heights: set[int] = set()
-    for fmt in progressive:
-        h = fmt.get("height") or 0
+    for rec in progressive:
+        h = rec["height"]
         if h > 0:
             progressive_heights.add(h)
-        result.append(_format_source(fmt, "video", is_progressive=True))
-    
+        result.append(_format_source(rec, "video", is_progressive=True))
+
     by_height_codec: dict[tuple[int, str], list[dict]] = {}
-    for fmt in videos:
-        h = fmt.get("height") or 0
+    for rec in videos:
+        h = rec["height"]
         if h <= 0:
             continue
-        codec = normalize_codec_name(fmt.get("vcodec") or "")
-        key = (h, codec)
-        if key not in by_height_codec:
-            by_height_codec[key] = []
-        by_height_codec[key].append(fmt)
-    
-    unique_heights = sorted(set(h for h, _ in by_height_codec.keys()), reverse=True)
-    
+        by_height_codec.setdefault((h, rec["codec"]), []).append(rec)
+
+    unique_heights = sorted({h for h, _ in by_height_codec}, reverse=True)
+
     for h in unique_heights:
         codecs_at_height = []
         for codec in ["H.264", "VP9", "AV1", "HEVC"]:
@@ -302,13 +297,12 @@ def process_youtube_formats(
                 continue
             key = (h, codec)
             if key in by_height_codec:
-                candidates = by_height_codec[key]
-                candidates.sort(key=lambda f: codec_priority.get(normalize_codec_name(f.get("vcodec") or ""), 99))
-                codecs_at_height.append(candidates[0])
-        
-        for fmt in codecs_at_height:
-            result.append(_format_source(fmt, "video", is_progressive=False))
-    
-    hls_sources = [_format_source(fmt, "video", is_progressive=False) for fmt in hls_formats]
-    
-    return result, process_audio_formats(audios), hls_sources 
+                # Every candidate shares the codec; prefer the highest bitrate variant
+                codecs_at_height.append(max(by_height_codec[key], key=lambda r: r["fmt"].get("tbr") or 0))
+
+        for rec in codecs_at_height:
+            result.append(_format_source(rec, "video", is_progressive=False))
+
+    hls_sources = [_format_source(rec, "video", is_progressive=False) for rec in hls_formats]
+
+    return result, _process_audio_records(audios), hls_sources
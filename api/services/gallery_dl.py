@@ -2,34 +2,12 @@
 
 from __future__ import annotations
 
-from typing import Any
-
-from ..config import DEFAULT_USER_AGENT, detect_platform
+from ..config import DEFAULT_USER_AGENT
 from ..errors import ErrorCode, create_error_response, detect_error_code
-from .transforms import transform_gallery_dl_result, transform_pinterest_result, transform_weibo_result
-
-
-def _get_transformer(platform: str):
-    if platform == "pinterest":
-        return transform_pinterest_result
-    if platform == "weibo":
-        return transform_weibo_result
-    return transform_gallery_dl_result
-
-
-def _normalize_gallery_results(data: Any) -> list[dict]:
-    if isinstance(data, list):
-        return [entry for entry in data if isinstance(entry, dict)]
-    if isinstance(data, dict):
-        if isinstance(data.get("items"), list):
-            return [entry for entry in data.get("items") if isinstance(entry, dict)]
-        return [data]
-    return []
+from .transforms import gallery_dl_item, transform_gallery_dl_items
 
 
 def extract_with_gallery_dl(url: str, cookie: str | None = None) -> dict:
-    platform = detect_platform(url) or "unknown"
-
     try:
         from gallery_dl import config as gdl_config
         from gallery_dl import job
@@ -41,25 +19,30 @@ def extract_with_gallery_dl(url: str, cookie: str | None = None) -> dict:
             gdl_config.set(("extractor",), "cookies", cookie)
 
         class MetadataJob(job.Job):
-            def __init__(self, target_url: str):
+            """Build response items as gallery-dl emits metadata, in a single pass."""
+
+            def __init__(self, target_url: str, make_item):
                 super().__init__(target_url)
-                self.results = []
+                self.make_item = make_item
+                self.seen = 0
+                self.items = []
 
             def dispatch(self, msg):
                 if isinstance(msg, tuple) and len(msg) >= 3 and msg[0] == 3:
                     payload = msg[2]
                     if isinstance(payload, dict):
-                        self.results.append(payload)
+                        item = self.make_item(self.seen, payload)
+                        self.seen += 1
+                        if item:
+                            self.items.append(item)
 
-        collector = MetadataJob(url)
+        collector = MetadataJob(url, gallery_dl_item)
         collector.run()
 
-        results = _normalize_gallery_results(collector.results)
-        if not results:
+        if not collector.seen:
             return create_error_response(ErrorCode.NO_MEDIA_FOUND, "No media found from gallery-dl")
 
-        transformer = _get_transformer(platform)
-        return transformer(results, url)
+        return transform_gallery_dl_items(collector.items, url)
     except Exception as exc:
         code = detect_error_code(str(exc))
         return create_error_response(code, str(exc))
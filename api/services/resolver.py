@@ -2,67 +2,96 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
-from ..config import HTTP_CLIENT, SHORT_URL_PATTERNS, TRACKING_PARAMS
+from ..config import HTTP_CLIENT, TRACKING_PARAMS, create_async_client, match_short_url
+
+_TRACKING_PARAMS_LOWER = frozenset(param.lower() for param in TRACKING_PARAMS)
+_MEDIA_DROP_PARAMS = frozenset(("download", "download_filename"))
+_WRAPPER_RE = re.compile(r"rule34video\.com/get_file/|eporner\.com/.*redirect", re.IGNORECASE)
+
+
+def _strip_query_keys(final_url: str, drop_set: frozenset[str]) -> str:
+    """Drop query keys (compared lowercase) found in drop_set, and the fragment."""
+    parsed = urlparse(final_url)
+    query = parse_qs(parsed.query, keep_blank_values=True)
+    cleaned = {key: value for key, value in query.items() if key.lower() not in drop_set}
+    query_str = urlencode({k: v[0] if len(v) == 1 else v for k, v in cleaned.items()}, doseq=True)
+    return urlunparse((parsed.scheme, parsed.netloc, parsed.path, parsed.params, query_str, ""))
 
 
 def resolve_short_url(url: str, platform: str | None = None) -> str:
     del platform
-    is_short = any(re.search(pattern, url, re.IGNORECASE) for pattern in SHORT_URL_PATTERNS.values())
-    if not is_short:
+    if not match_short_url(url):
         return url
 
     try:
         response = HTTP_CLIENT.head(url)
-        parsed = urlparse(str(response.url))
-        query = parse_qs(parsed.query, keep_blank_values=True)
-        cleaned = {
-            key: value
-            for key, value in query.items()
-            if key.lower() not in [tracked.lower() for tracked in TRACKING_PARAMS]
-        }
-        query_str = urlencode({k: v[0] if len(v) == 1 else v for k, v in cleaned.items()}, doseq=True)
-        return urlunparse((parsed.scheme, parsed.netloc, parsed.path, parsed.params, query_str, ""))
+        return _strip_query_keys(str(response.url), _TRACKING_PARAMS_LOWER)
     except Exception:
         return url
 
 
+def _clean_media_url(url: str, final_url: str) -> str:
+    if "youtube.com" in final_url or "youtu.be" in final_url:
+        return url
+    return _strip_query_keys(final_url, _MEDIA_DROP_PARAMS)
+
+
 def resolve_media_url(url: str) -> str:
-    wrapper_patterns = [r"rule34video\.com/get_file/", r"eporner\.com/.*redirect"]
-    if not any(re.search(pattern, url, re.IGNORECASE) for pattern in wrapper_patterns):
+    if not _WRAPPER_RE.search(url):
         return url
 
     try:
         response = HTTP_CLIENT.head(url)
-        final_url = str(response.url)
-        if "youtube.com" in final_url or "youtu.be" in final_url:
-            return url
-
-        parsed = urlparse(final_url)
-        query = parse_qs(parsed.query, keep_blank_values=True)
-        cleaned = {
-            key: value for key, value in query.items() if key.lower() not in ["download", "download_filename"]
-        }
-        query_str = urlencode({k: v[0] if len(v) == 1 else v for k, v in cleaned.items()}, doseq=True)
-        return urlunparse((parsed.scheme, parsed.netloc, parsed.path, parsed.params, query_str, ""))
+        return _clean_media_url(url, str(response.url))
+    except Exception:
+        return url
+
+
+async def _resolve_media_url_async(client, url: str) -> str:
+    try:
+        response = await client.head(url)
+        return _clean_media_url(url, str(response.url))
     except Exception:
         return url
 
 
+async def _resolve_media_urls_async(urls: list[str]) -> list[str]:
+    async with create_async_client() as client:
+        return await asyncio.gather(*(_resolve_media_url_async(client, url) for url in urls))
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
 def resolve_media_urls_parallel(urls: list[str]) -> list[str]:
-    wrapper_patterns = [r"rule34video\.com/get_file/", r"eporner\.com/.*redirect"]
-    to_resolve: list[tuple[int, str]] = []
-    for index, url in enumerate(urls):
-        if any(re.search(pattern, url, re.IGNORECASE) for pattern in wrapper_patterns):
-            to_resolve.append((index, url))
+    to_resolve = [(index, url) for index, url in enumerate(urls) if _WRAPPER_RE.search(url)]
 
     if not to_resolve:
         return urls
 
     result = list(urls)
+    if len(to_resolve) == 1:
+        idx, url = to_resolve[0]
+        result[idx] = resolve_media_url(url)
+        return result
+
+    if not _in_event_loop():
+        resolved = asyncio.run(_resolve_media_urls_async([url for _, url in to_resolve]))
+        for (idx, _), final_url in zip(to_resolve, resolved):
+            result[idx] = final_url
+        return result
+
+    # asyncio.run cannot nest inside a running loop; fall back to worker threads.
     with ThreadPoolExecutor(max_workers=5) as executor:
         future_map = {executor.submit(resolve_media_url, url): idx for idx, url in to_resolve}
         for future in as_completed(future_map):
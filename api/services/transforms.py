@@ -6,6 +6,8 @@ from ..config import detect_platform
 from .formats import process_audio_formats, process_video_formats, process_youtube_formats
 from .resolver import resolve_media_urls_parallel
 
+_VIDEO_EXTS = (".mp4", ".webm", ".m3u8")
+
 
 def _stats(info: dict) -> dict:
     return {
@@ -149,30 +151,28 @@ def _get_valid_thumbnail(metadata: dict, media_url: str) -> str | None:
     return None
 
 
-def transform_gallery_dl_result(results: list[dict], original_url: str) -> dict:
-    platform = detect_platform(original_url) or "unknown"
-    items: list[dict] = []
-
-    for idx, result in enumerate(results or []):
-        url = result.get("url") or result.get("file_url") or result.get("source")
-        if not url:
-            continue
-        is_video = str(url).lower().endswith((".mp4", ".webm", ".m3u8"))
-        items.append(
+def gallery_dl_item(index: int, result: dict) -> dict | None:
+    """Build a response item from one gallery-dl metadata payload, or None if it has no media URL."""
+    url = result.get("url") or result.get("file_url") or result.get("source")
+    if not url:
+        return None
+    is_video = str(url).lower().endswith(_VIDEO_EXTS)
+    return {
+        "index": index,
+        "type": "video" if is_video else "image",
+        "thumbnail": _get_valid_thumbnail(result, str(url)),
+        "sources": [
             {
-                "index": idx,
-                "type": "video" if is_video else "image",
-                "thumbnail": _get_valid_thumbnail(result, str(url)),
-                "sources": [
-                    {
-                        "quality": "original",
-                        "url": str(url),
-                        "mime": "video/mp4" if is_video else "image/jpeg",
-                    }
-                ],
+                "quality": "original",
+                "url": str(url),
+                "mime": "video/mp4" if is_video else "image/jpeg",
             }
-        )
+        ],
+    }
 
+
+def transform_gallery_dl_items(items: list[dict], original_url: str) -> dict:
+    platform = detect_platform(original_url) or "unknown"
     if not items:
         return {"success": False, "error": {"code": "NO_MEDIA_FOUND", "message": "No media found"}}
 
@@ -182,11 +182,3 @@ def transform_gallery_dl_result(results: list[dict], original_url: str) -> dict:
         "contentType": "gallery" if len(items) > 1 else items[0]["type"],
         "items": items,
     }
-
-
-def transform_pinterest_result(results: list[dict], original_url: str) -> dict:
-    return transform_gallery_dl_result(results, original_url)
-
-
-def transform_weibo_result(results: list[dict], original_url: str) -> dict:
-    return transform_gallery_dl_result(results, original_url)
@@ -20,19 +20,43 @@ from .transforms import (
 )
 
 
+_TRANSFORMERS = {
+    "twitch": transform_twitch_result,
+    "bandcamp": transform_bandcamp_result,
+    "eporner": transform_eporner_result,
+    "rule34video": transform_nsfw_video_result,
+}
+
+
 def _get_transformer(platform: str):
-    if platform == "twitch":
-        return transform_twitch_result
-    if platform == "bandcamp":
-        return transform_bandcamp_result
-    if platform == "eporner":
-        return transform_eporner_result
-    if platform == "rule34video":
-        return transform_nsfw_video_result
-    return transform_ytdlp_result
+    return _TRANSFORMERS.get(platform, transform_ytdlp_result)
+
+
+# Cookie files live for one extraction; keep them on tmpfs when the host has it.
+_COOKIE_TMPDIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+_BASE_YDL_OPTS = {
+    "quiet": True,
+    "no_warnings": True,
+    "extract_flat": False,
+    "skip_download": True,
+    "noplaylist": False,
+    "socket_timeout": 15,
+    "retries": 3,
+    "http_headers": {"User-Agent": DEFAULT_USER_AGENT},
+    "youtube_include_hls_manifest": True,
+    "youtube_include_dash_manifest": True,
+}
+
+_CANONICAL_WATCH_PREFIX = "https://www.youtube.com/watch?v="
 
 
 def _canonicalize_youtube_watch_url(url: str) -> str:
+    if url.startswith(_CANONICAL_WATCH_PREFIX):
+        tail = url[len(_CANONICAL_WATCH_PREFIX) :]
+        if "&" not in tail and "#" not in tail:
+            return url
+
     parts = urlsplit(url)
     host = (parts.hostname or "").lower()
     is_youtube_watch = host.endswith("youtube.com") and parts.path == "/watch"
@@ -52,31 +76,33 @@ def _canonicalize_youtube_watch_url(url: str) -> str:
     return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(canonical_query), ""))
 
 
+def _ydl_opts(noplaylist: bool) -> dict:
+    if noplaylist:
+        # Single-video mode: a bare playlist URL only needs the first entry, which is all the transform reads.
+        return {**_BASE_YDL_OPTS, "noplaylist": True, "playlist_items": "1"}
+    return {**_BASE_YDL_OPTS, "noplaylist": False}
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
 def extract_with_ytdlp(url: str, cookie: str | None = None) -> dict:
     platform = detect_platform(url) or "unknown"
     extraction_url = _canonicalize_youtube_watch_url(url) if platform == "youtube" else url
+    noplaylist = platform == "youtube"
 
-    ydl_opts = {
-        "quiet": True,
-        "no_warnings": True,
-        "extract_flat": False,
-        "skip_download": True,
-        "noplaylist": False,
-        "socket_timeout": 15,
-        "retries": 3,
-        "http_headers": {"User-Agent": DEFAULT_USER_AGENT},
-        "youtube_include_hls_manifest": True,
-        "youtube_include_dash_manifest": True,
-    }
-    if platform == "youtube":
-        ydl_opts["noplaylist"] = True
-
+    ydl_opts = _ydl_opts(noplaylist)
     cookie_file: str | None = None
     try:
         if cookie:
-            with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False, encoding="utf-8") as handle:
-                handle.write(convert_cookie_to_netscape(cookie))
-                cookie_file = handle.name
+            fd, cookie_file = tempfile.mkstemp(suffix=".txt", dir=_COOKIE_TMPDIR)
+            try:
+                _write_all(fd, convert_cookie_to_netscape(cookie).encode("utf-8"))
+            finally:
+                os.close(fd)
             ydl_opts["cookiefile"] = cookie_file
 
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
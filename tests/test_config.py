@@ -1,6 +1,14 @@
 import unittest
 
-from api.config import GALLERY_DL_PLATFORMS, NSFW_PLATFORMS, PLATFORM_CONFIG, YTDLP_PLATFORMS, detect_platform
+from api.config import (
+    GALLERY_DL_PLATFORMS,
+    NSFW_PLATFORMS,
+    PLATFORM_CONFIG,
+    SHORT_URL_PATTERNS,
+    YTDLP_PLATFORMS,
+    detect_platform,
+    match_short_url,
+)
 
 
 class ConfigTests(unittest.TestCase):
@@ -12,12 +20,25 @@ class ConfigTests(unittest.TestCase):
     def test_detect_platform(self):
         self.assertEqual(detect_platform("https://www.youtube.com/watch?v=abc"), "youtube")
         self.assertEqual(detect_platform("https://pin.it/abc123"), "pinterest")
+        self.assertEqual(detect_platform("https://v.redd.it/abc123"), "reddit")
+        self.assertEqual(detect_platform("https://artist.bandcamp.com/track/x"), "bandcamp")
+        self.assertEqual(detect_platform("https://www.twitch.tv/someone/clip/Abc"), "twitch")
+        self.assertIsNone(detect_platform("https://www.twitch.tv/someone"))
 
     def test_derived_lists(self):
         self.assertIn("youtube", YTDLP_PLATFORMS)
         self.assertIn("reddit", GALLERY_DL_PLATFORMS)
         self.assertIn("eporner", NSFW_PLATFORMS)
 
+    def test_short_url_patterns_precompiled(self):
+        self.assertTrue(SHORT_URL_PATTERNS["pin.it"].search("https://PIN.IT/abc123"))
+        self.assertIsNone(SHORT_URL_PATTERNS["b23.tv"].search("https://www.bilibili.com/video/BV1"))
+
+    def test_match_short_url_reports_pattern_name(self):
+        self.assertEqual(match_short_url("https://b23.tv/abc123"), "b23.tv")
+        self.assertEqual(match_short_url("https://redd.it/abc123"), "redd.it")
+        self.assertIsNone(match_short_url("https://www.youtube.com/watch?v=abc"))
+
 
 if __name__ == "__main__":
     unittest.main()
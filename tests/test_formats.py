@@ -7,6 +7,7 @@ from api.services.formats import (
     normalize_audio_codec_name,
     normalize_codec_name,
     process_youtube_formats,
+    sanitize_filename,
 )
 
 
@@ -14,14 +15,24 @@ class FormatsTests(unittest.TestCase):
     def test_codec_normalization(self):
         self.assertEqual(normalize_codec_name("avc1.4d401f"), "H.264")
         self.assertEqual(normalize_codec_name("vp9"), "VP9")
+        self.assertEqual(normalize_codec_name("av01.0.04M.08"), "AV1")
+        self.assertEqual(normalize_codec_name("hev1.1.6.L93"), "HEVC")
+        self.assertEqual(normalize_codec_name(""), "Unknown")
 
     def test_audio_codec_normalization(self):
         self.assertEqual(normalize_audio_codec_name("mp4a.40.2"), "AAC")
+        self.assertEqual(normalize_audio_codec_name("opus"), "Opus")
+        self.assertEqual(normalize_audio_codec_name("ac-3"), "ac-3")
 
     def test_mime_extension_mapping(self):
         self.assertEqual(get_extension_from_mime("video/mp4"), "mp4")
         self.assertEqual(get_mime_from_extension("mp3", "audio"), "audio/mpeg")
 
+    def test_sanitize_filename(self):
+        self.assertEqual(sanitize_filename('a<b>:c"d/e\\f|g?h*i\x01j   k.'), "abcdefghij k")
+        self.assertEqual(sanitize_filename(""), "media")
+        self.assertEqual(sanitize_filename("..."), "media")
+
     def test_process_youtube_formats_prefers_progressive_upto_720p(self):
         formats = [
             {
@@ -57,8 +68,8 @@ class FormatsTests(unittest.TestCase):
         selected_720 = [s for s in videos if s.get("quality") == "720p"]
         self.assertTrue(selected_720)
         self.assertEqual(selected_720[0]["url"], "https://cdn.example/prog-720.mp4")
-        self.assertTrue(selected_720[0].get("hasAudio"))
-        self.assertFalse(selected_720[0].get("needsMerge"))
+        self.assertIs(selected_720[0].get("hasAudio"), True)
+        self.assertIs(selected_720[0].get("needsMerge"), False)
         self.assertTrue(audios)
 
     def test_hls_detection_with_manifest_in_url(self):
@@ -73,6 +84,15 @@ class FormatsTests(unittest.TestCase):
         fmt = {"url": "https://cdn.example/index.m3u8", "protocol": "https"}
         self.assertTrue(is_hls_format(fmt))
 
+    def test_hls_detection_with_query_string(self):
+        self.assertTrue(is_hls_format({"url": "https://cdn.example/index.M3U8?token=abc", "protocol": "https"}))
+        self.assertFalse(is_hls_format({"url": "https://cdn.example/clip.m3u8.mp4", "protocol": "https", "ext": "mp4"}))
+
+    def test_hls_detection_with_native_protocol(self):
+        fmt = {"url": "https://cdn.example/stream", "protocol": "m3u8_native"}
+        self.assertTrue(is_hls_format(fmt))
+        self.assertFalse(is_hls_format({"url": "https://cdn.example/v.mp4", "protocol": "https", "ext": "mp4"}))
+
     def test_multi_codec_support_same_resolution(self):
         formats = [
             {
@@ -112,6 +132,16 @@ class FormatsTests(unittest.TestCase):
         self.assertIn("H.264", codecs)
         self.assertIn("VP9", codecs)
 
+    def test_youtube_picks_highest_bitrate_within_codec_bucket(self):
+        formats = [
+            {"url": "https://cdn.example/low.webm", "vcodec": "vp9", "acodec": "none", "height": 1080, "tbr": 900},
+            {"url": "https://cdn.example/high.webm", "vcodec": "vp9", "acodec": "none", "height": 1080, "tbr": 2500},
+        ]
+
+        videos, _audios, _hls = process_youtube_formats(formats, info={})
+
+        self.assertEqual([v["url"] for v in videos], ["https://cdn.example/high.webm"])
+
 
 if __name__ == "__main__":
     unittest.main()
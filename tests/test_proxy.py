@@ -10,11 +10,16 @@ class _Resp:
         self.content = content
         self.status_code = status_code
         self.headers = {"content-type": content_type}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
 
 
 class ProxyTests(unittest.TestCase):
-    def setUp(self):
-        self.client = create_app().test_client()
+    @classmethod
+    def setUpClass(cls):
+        cls.client = create_app().test_client()
 
     @patch("api.routes.proxy.HTTP_CLIENT.get")
     def test_playlist_rewrite(self, mock_get):
@@ -25,12 +30,39 @@ class ProxyTests(unittest.TestCase):
         self.assertIn("/api/yt-stream?url=", body)
         self.assertIn("chunk=1", body)
 
+    @patch("api.routes.proxy.HTTP_CLIENT.get")
+    def test_playlist_rewrite_keeps_tags_and_resolves_relative_uris(self, mock_get):
+        playlist = "#EXTM3U\n#EXTINF:5,\nseg/1.ts\n\n#EXT-X-ENDLIST\n"
+        mock_get.return_value = _Resp(text=playlist)
+        res = self.client.get("/api/yt-stream?url=https%3A%2F%2Fexample.com%2Fhls%2Findex.m3u8")
+        self.assertEqual(
+            res.get_data(as_text=True),
+            "#EXTM3U\n#EXTINF:5,\n/api/yt-stream?url=https%3A%2F%2Fexample.com%2Fhls%2Fseg%2F1.ts&chunk=1\n\n#EXT-X-ENDLIST\n",
+        )
+
+    @patch("api.routes.proxy.HTTP_CLIENT.get")
+    def test_playlist_detected_by_content_type_with_params(self, mock_get):
+        mock_get.return_value = _Resp(text="#EXTM3U\nseg.ts\n", content_type="application/x-mpegURL; charset=utf-8")
+        res = self.client.get("/api/yt-stream?url=https%3A%2F%2Fexample.com%2Fhls%2Fmaster")
+        self.assertEqual(res.headers["Content-Type"], "application/vnd.apple.mpegurl")
+        self.assertIn("chunk=1", res.get_data(as_text=True))
+
+    @patch("api.routes.proxy.HTTP_CLIENT.get")
+    def test_playlist_detected_for_application_mpegurl(self, mock_get):
+        mock_get.return_value = _Resp(text="#EXTM3U\nseg.ts\n", content_type="application/mpegurl")
+        res = self.client.get("/api/yt-stream?url=https%3A%2F%2Fexample.com%2Fhls%2Fmaster")
+        self.assertEqual(
+            res.get_data(as_text=True),
+            "#EXTM3U\n/api/yt-stream?url=https%3A%2F%2Fexample.com%2Fhls%2Fseg.ts&chunk=1\n",
+        )
+
     @patch("api.routes.proxy.HTTP_CLIENT.get")
     def test_chunk_passthrough(self, mock_get):
         mock_get.return_value = _Resp(content=b"abc", content_type="video/mp2t")
         res = self.client.get("/api/yt-stream?url=https%3A%2F%2Fexample.com%2Fchunk.ts&chunk=1")
         self.assertEqual(res.status_code, 200)
         self.assertEqual(res.get_data(), b"abc")
+        self.assertTrue(mock_get.return_value.closed)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import AsyncMock, Mock, patch
 
 from api.services.resolver import resolve_media_urls_parallel, resolve_short_url
 
@@ -8,7 +9,9 @@ class ResolverTests(unittest.TestCase):
         url = "https://youtube.com/watch?v=abc"
         self.assertEqual(resolve_short_url(url), url)
 
-    def test_parallel_keeps_order(self):
+    @patch("api.services.resolver.HTTP_CLIENT.head")
+    def test_parallel_keeps_order(self, mock_head):
+        mock_head.return_value = Mock(url="https://cdn.example/v.mp4")
         urls = [
             "https://example.com/video.mp4",
             "https://rule34video.com/get_file/some-id",
@@ -17,8 +20,32 @@ class ResolverTests(unittest.TestCase):
         resolved = resolve_media_urls_parallel(urls)
         self.assertEqual(len(resolved), 3)
         self.assertEqual(resolved[0], urls[0])
+        self.assertEqual(resolved[1], "https://cdn.example/v.mp4")
         self.assertEqual(resolved[2], urls[2])
 
+    @patch("api.services.resolver.create_async_client")
+    def test_parallel_strips_download_params(self, mock_client_factory):
+        client = mock_client_factory.return_value.__aenter__.return_value
+        client.head = AsyncMock(return_value=Mock(url="https://cdn.example/v.mp4?download=1&t=2"))
+        urls = [
+            "https://example.com/a.mp4",
+            "https://rule34video.com/get_file/one",
+            "https://rule34video.com/get_file/two",
+        ]
+        resolved = resolve_media_urls_parallel(urls)
+        self.assertEqual(
+            resolved,
+            ["https://example.com/a.mp4", "https://cdn.example/v.mp4?t=2", "https://cdn.example/v.mp4?t=2"],
+        )
+
+    @patch("api.services.resolver.create_async_client")
+    @patch("api.services.resolver.HTTP_CLIENT.head")
+    def test_single_wrapper_url_skips_async_fanout(self, mock_head, mock_client_factory):
+        mock_head.return_value = Mock(url="https://cdn.example/v.mp4?download_filename=x")
+        resolved = resolve_media_urls_parallel(["https://rule34video.com/get_file/some-id"])
+        self.assertEqual(resolved, ["https://cdn.example/v.mp4"])
+        mock_client_factory.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
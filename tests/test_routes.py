@@ -1,18 +1,42 @@
+import json
 import unittest
+from datetime import date, datetime, timezone
 from unittest.mock import patch
 
-from api.app import create_app
+from flask.json.provider import DefaultJSONProvider
+
+from api import app as app_module
+from api.app import OrjsonProvider, create_app
 
 
 class RouteTests(unittest.TestCase):
-    def setUp(self):
-        self.client = create_app().test_client()
+    @classmethod
+    def setUpClass(cls):
+        cls.client = create_app().test_client()
 
     def test_health_route(self):
         res = self.client.get("/api/health")
         self.assertEqual(res.status_code, 200)
         self.assertEqual(res.json["status"], "ok")
 
+    @unittest.skipIf(app_module.orjson is None, "orjson not installed")
+    def test_responses_encoded_with_orjson(self):
+        self.assertIsInstance(self.client.application.json, OrjsonProvider)
+        with patch.object(app_module.orjson, "dumps", wraps=app_module.orjson.dumps) as mock_dumps:
+            res = self.client.post("/api/extract", data="x", content_type="text/plain")
+        mock_dumps.assert_called_once()
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.mimetype, "application/json")
+        body = res.get_data(as_text=True)
+        self.assertTrue(body.endswith("}\n"))
+        self.assertLess(body.index('"error"'), body.index('"success"'))
+
+    @unittest.skipIf(app_module.orjson is None, "orjson not installed")
+    def test_orjson_provider_keeps_flask_date_format(self):
+        provider = self.client.application.json
+        value = {"when": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc), "day": date(2024, 1, 2)}
+        self.assertEqual(json.loads(provider.dumps(value)), json.loads(DefaultJSONProvider.dumps(provider, value)))
+
     def test_extract_options_cors(self):
         res = self.client.options("/api/extract")
         self.assertEqual(res.status_code, 204)
@@ -24,6 +24,12 @@ class SecurityTests(unittest.TestCase):
         self.assertIn("# Netscape HTTP Cookie File", converted)
         self.assertIn("sid", converted)
 
+    def test_convert_cookie_tab_separated(self):
+        raw = ".youtube.com\tTRUE\t/\tTRUE\t0\tsid\tabc"
+        converted = convert_cookie_to_netscape(raw)
+        self.assertTrue(converted.startswith("# Netscape HTTP Cookie File"))
+        self.assertTrue(converted.endswith(raw))
+
 
 if __name__ == "__main__":
     unittest.main()
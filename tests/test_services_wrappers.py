@@ -1,9 +1,21 @@
 import unittest
 from unittest.mock import patch
 
-from api.services.gallery_dl import _normalize_gallery_results
+from api.services.gallery_dl import extract_with_gallery_dl
 from api.services.transforms import transform_ytdlp_result
-from api.services.ytdlp import extract_with_ytdlp
+from api.services.ytdlp import _canonicalize_youtube_watch_url, extract_with_ytdlp
+
+
+def _fake_gallery_job(payloads):
+    class FakeJob:
+        def __init__(self, url):
+            self.url = url
+
+        def run(self):
+            for payload in payloads:
+                self.dispatch((3, payload.get("url", ""), payload))
+
+    return FakeJob
 
 
 class ServiceWrapperTests(unittest.TestCase):
@@ -51,14 +63,39 @@ class ServiceWrapperTests(unittest.TestCase):
         self.assertTrue(result["success"])
         ydl_opts = mocked_ytdl.call_args.args[0]
         self.assertTrue(ydl_opts["noplaylist"])
+        self.assertEqual(ydl_opts["playlist_items"], "1")
         mocked_instance.extract_info.assert_called_once_with(
             "https://www.youtube.com/watch?v=aSi7mt3Z_ys",
             download=False,
         )
 
-    def test_gallery_normalization(self):
-        result = _normalize_gallery_results({"items": [{"url": "https://cdn.example/img.jpg"}]})
-        self.assertEqual(len(result), 1)
+    def test_canonicalize_youtube_watch_url(self):
+        canonical = "https://www.youtube.com/watch?v=abc"
+        self.assertEqual(_canonicalize_youtube_watch_url(canonical), canonical)
+        self.assertEqual(_canonicalize_youtube_watch_url(canonical + "&list=RDabc&t=5"), canonical + "&t=5")
+
+    def test_gallery_extract_skips_entries_without_media(self):
+        payloads = [{"title": "no media"}, {"url": "https://cdn.example/clip.mp4"}]
+        with patch("gallery_dl.job.Job", _fake_gallery_job(payloads)):
+            result = extract_with_gallery_dl("https://www.pinterest.com/pin/1/")
+        self.assertTrue(result["success"])
+        self.assertEqual(result["platform"], "pinterest")
+        self.assertEqual(result["contentType"], "video")
+        self.assertEqual([item["index"] for item in result["items"]], [1])
+
+    def test_gallery_extract_without_payloads(self):
+        with patch("gallery_dl.job.Job", _fake_gallery_job([])):
+            result = extract_with_gallery_dl("https://www.pinterest.com/pin/1/")
+        self.assertFalse(result["success"])
+        self.assertEqual(result["error"]["code"], "NO_MEDIA_FOUND")
+        self.assertEqual(result["error"]["message"], "No media found from gallery-dl")
+
+    def test_gallery_extract_with_payloads_but_no_media(self):
+        with patch("gallery_dl.job.Job", _fake_gallery_job([{"title": "a"}, {"title": "b"}])):
+            result = extract_with_gallery_dl("https://www.pinterest.com/pin/1/")
+        self.assertFalse(result["success"])
+        self.assertEqual(result["error"]["code"], "NO_MEDIA_FOUND")
+        self.assertEqual(result["error"]["message"], "No media found")
 
     def test_transforms_alias_callable(self):
         result = transform_ytdlp_result({"formats": [], "title": "x"}, "https://youtube.com/watch?v=abc")